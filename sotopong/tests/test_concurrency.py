@@ -0,0 +1,71 @@
+"""
+Параллельные удаления и записи матчей: без дедлоков и с согласованным рейтингом.
+Нужен живой PostgreSQL: DATABASE_URL=... python -m unittest discover sotopong/tests
+"""
+
+import os, sys, random, threading, unittest, uuid
+
+if not os.getenv("DATABASE_URL"):
+    raise unittest.SkipTest("DATABASE_URL is required (PostgreSQL)")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import server
+from fastapi.testclient import TestClient
+
+
+def run_threads(targets):
+    threads = [threading.Thread(target=t) for t in targets]
+    [t.start() for t in threads]
+    [t.join() for t in threads]
+
+
+class ConcurrentDeleteTest(unittest.TestCase):
+    def test_concurrent_match_deletes_keep_ratings_consistent(self):
+        tag = uuid.uuid4().hex[:6]
+        names = [f"dl-{tag}-{i}" for i in range(5)]
+        rnd = random.Random(1)
+        statuses = []
+
+        def match_body(r):
+            a, b, c, d = r.sample(names, 4)
+            body = {"p1_name": a, "p2_name": b, "score1": 11, "score2": r.randint(0, 9)}
+            if r.random() < 0.75:
+                body.update(p1b_name=c, p2b_name=d)
+            return body
+
+        # 500 (например, DeadlockDetected) должен попасть в statuses, а не уронить поток
+        with TestClient(server.app, raise_server_exceptions=False) as cl:
+            for n in names:
+                self.assertEqual(cl.post("/api/players", json={"name": n}).status_code, 201)
+            ids = [cl.post("/api/matches", json=match_body(rnd)).json()["id"] for _ in range(400)]
+
+            def deleter(chunk):
+                return lambda: statuses.extend(cl.delete(f"/api/matches/{mid}").status_code for mid in chunk)
+
+            def creator(seed):
+                r = random.Random(seed)
+                return lambda: statuses.extend(
+                    cl.post("/api/matches", json=match_body(r)).status_code for _ in range(30))
+
+            run_threads([deleter(ids[i::10]) for i in range(10)] + [creator(i) for i in range(3)])
+            self.assertLessEqual(set(statuses), {200, 201})
+
+            # Рейтинг каждого = старт + дельты оставшихся матчей
+            expected = {n: [server.INITIAL_ELO, 0, 0] for n in names}
+            for m in cl.get("/api/matches").json():
+                team1_won = m["s1"] > m["s2"]
+                for n, d, won in ((m["p1"], m["d1"], team1_won), (m["p1b"], m["d1"], team1_won),
+                                  (m["p2"], m["d2"], not team1_won), (m["p2b"], m["d2"], not team1_won)):
+                    if n in expected:
+                        expected[n][0] += d
+                        expected[n][1 if won else 2] += 1
+            players = {p["name"]: [p["rating"], p["wins"], p["losses"]] for p in cl.get("/api/players").json()}
+            self.assertEqual({n: players[n] for n in names}, expected)
+
+            # Удаление игроков параллельно с новыми матчами (404 — игрок уже удалён)
+            statuses.clear()
+            pids = [p["id"] for p in cl.get("/api/players").json() if p["name"] in names]
+            run_threads([lambda pid=pid: statuses.append(cl.delete(f"/api/players/{pid}").status_code)
+                         for pid in pids] + [creator(10 + i) for i in range(3)])
+            self.assertLessEqual(set(statuses), {200, 201, 404})
+            self.assertEqual(statuses.count(200), len(pids))